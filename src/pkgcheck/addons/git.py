@@ -488,6 +488,8 @@ class GitAddon(caches.CachedAddon):
 
         # mapping of repo locations to their corresponding git repo caches
         self._cached_repos = {}
+        # package history parsed for the most recent local commits query
+        self._commits_data = None
 
     @jit_attr
     def _gitignore(self):
@@ -656,9 +658,17 @@ class GitAddon(caches.CachedAddon):
         except GitError as e:
             raise PkgcheckUserException(str(e))
 
+        self._commits_data = data
         repo_id = f"{target_repo.repo_id}-commits"
         return repo_cls(data, repo_id=repo_id)
 
+    def cached_commits_repo(self, repo_cls):
+        """Create a repo from previously parsed local commits, parsing them if required."""
+        if self._commits_data is None:
+            return self.commits_repo(repo_cls)
+        repo_id = f"{self.options.target_repo.repo_id}-commits"
+        return repo_cls(self._commits_data, repo_id=repo_id)
+
     def commits(self):
         target_repo = self.options.target_repo
         commits = ()
@@ -2,13 +2,15 @@
 
 import os
 import re
+import shutil
 import subprocess
 import tarfile
 from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from itertools import chain
 from operator import attrgetter
-from tempfile import TemporaryDirectory
+from tempfile import TemporaryDirectory, TemporaryFile
 from urllib.parse import urlparse
 
 from pkgcore.ebuild.misc import sort_keywords
@@ -22,7 +24,30 @@ from .. import base, results, sources
 from ..addons import git
 from ..base import PkgcheckUserException
 from . import GentooRepoCheck, GitCommitsCheck
-from .header import copyright_regex
+
+# only the end year of copyright lines is relevant to git checks, the full
+# line is verified by the header checks
+copyright_year_regex = re.compile(r"# Copyright (?:\d{4}-)?(?P<end>\d{4}) .")
+
+
+def _union_keywords(pkgs):
+    """Return the set of keywords across all given packages."""
+    keywords = set()
+    for pkg in pkgs:
+        keywords.update(pkg.keywords)
+    return keywords
+
+
+def outdated_copyright_year(line, year):
+    """Return the end year of a copyright line if it doesn't match a given year."""
+    # skip parsing the common case of up to date "# Copyright [YYYY-]YEAR " lines
+    if line.startswith(f"{year} ", 12) or line.startswith(f"-{year} ", 16):
+        return None
+    if mo := copyright_year_regex.match(line):
+        end = mo.group("end")
+        if int(end) != year:
+            return end
+    return None
 
 
 class GitCommitsRepoSource(sources.RepoSource):
@@ -174,10 +199,22 @@ class MissingMove(results.PackageResult, results.Error):
 class _RemovalRepo(UnconfiguredTree):
     """Repository of removed packages stored in a temporary directory."""
 
-    def __init__(self, repo):
+    def __init__(self, repo, commit_paths=None):
         self.__parent_repo = repo
         self.__tmpdir = TemporaryDirectory(prefix="tmp-pkgcheck-", suffix=".repo")
         self.__created = False
+        # parent commit the shared eclass and profiles dirs were extracted from
+        self.__shared_commit = None
+        # mapping of commits to pkg dirs extracted together in a single archive
+        self.__commit_paths = commit_paths if commit_paths is not None else {}
+        # mapping of extracted pkg dirs to the parent commits they were extracted from
+        self.__extracted = {}
+        # pkg dirs extracted alongside other pkgs that haven't been populated themselves
+        self.__batched = set()
+        # shared dirs required for sourcing pkgs
+        self.__shared_paths = [
+            x for x in ("eclass", "profiles") if os.path.exists(pjoin(repo.location, x))
+        ]
         repo_dir = self.__tmpdir.name
 
         # set up some basic repo files so pkgcore doesn't complain
@@ -194,7 +231,7 @@ class _RemovalRepo(UnconfiguredTree):
 
     def __call__(self, pkgs):
         """Update the repo with a given sequence of packages."""
-        self._populate(pkgs)
+        self.populate(pkgs)
         if self.__created:
             # notify the repo object that new pkgs were added
             for pkg in pkgs:
@@ -202,24 +239,62 @@ class _RemovalRepo(UnconfiguredTree):
         self.__created = True
         return self
 
-    def _populate(self, pkgs):
-        """Populate the repo with a given sequence of historical packages."""
+    def populate(self, pkgs):
+        """Populate the repo with a given sequence of historical packages.
+
+        Repo objects aren't notified about the added packages so this is safe
+        to run in a separate thread.
+        """
         pkg = min(pkgs, key=attrgetter("time"))
-        paths = [pjoin(pkg.category, pkg.package)]
-        for subdir in ("eclass", "profiles"):
-            if os.path.exists(pjoin(self.__parent_repo.location, subdir)):
-                paths.append(subdir)
-        old_files = subprocess.Popen(
-            ["git", "archive", f"{pkg.commit}~1"] + paths,
-            stdout=subprocess.PIPE,
-            stderr=subprocess.PIPE,
-            cwd=self.__parent_repo.location,
-        )
-        if old_files.poll():
-            error = old_files.stderr.read().decode().strip()
+        commit = f"{pkg.commit}~1"
+        path = pjoin(pkg.category, pkg.package)
+        pkg_paths = set()
+        if self.__extracted.get(path) != commit:
+            if path in self.__batched:
+                # drop files from a different commit pulled in by another pkg's archive
+                shutil.rmtree(pjoin(self.location, path), ignore_errors=True)
+            pkg_paths.add(path)
+            # batch never extracted pkg dirs changed in the same commit
+            pkg_paths.update(
+                x for x in self.__commit_paths.get(pkg.commit, ()) if x not in self.__extracted
+            )
+        self.__batched.discard(path)
+        paths = sorted(pkg_paths)
+        # shared dirs are only re-extracted when the parent commit changes
+        if commit != self.__shared_commit:
+            paths.extend(self.__shared_paths)
+        if not paths:
+            return
+        # stderr is spooled to a file so it can't block the process while
+        # the tar stream is consumed
+        with TemporaryFile() as stderr:
+            # avoid any submodule handling inherited from the repo's git config
+            old_files = subprocess.Popen(
+                ["git", "-c", "protocol.file.allow=never", "-c", "submodule.recurse=false"]
+                + ["archive", commit]
+                + paths,
+                stdout=subprocess.PIPE,
+                stderr=stderr,
+                cwd=self.__parent_repo.location,
+            )
+            error = None
+            try:
+                with tarfile.open(mode="r|", fileobj=old_files.stdout) as tar:
+                    tar.extractall(path=self.location)
+                # drain trailing archive padding so git doesn't fail writing to a closed pipe
+                old_files.stdout.read()
+            except tarfile.TarError as e:
+                error = str(e)
+            finally:
+                old_files.stdout.close()
+            if returncode := old_files.wait():
+                stderr.seek(0)
+                error = stderr.read().decode().strip() or f"exit status {returncode}"
+        if error is not None:
             raise PkgcheckUserException(f"failed populating archive repo: {error}")
-        with tarfile.open(mode="r|", fileobj=old_files.stdout) as tar:
-            tar.extractall(path=self.location)
+        self.__shared_commit = commit
+        self.__extracted.update((x, commit) for x in pkg_paths)
+        self.__batched.update(pkg_paths - {path})
 
 
 class GitPkgCommitsCheck(GentooRepoCheck, GitCommitsCheck):
@@ -247,24 +322,42 @@ class GitPkgCommitsCheck(GentooRepoCheck, GitCommitsCheck):
         super().__init__(*args)
         self.today = datetime.today()
         self.repo = self.options.target_repo
-        self.valid_arches = self.options.target_repo.known_arches
+        self.valid_arches = frozenset(self.options.target_repo.known_arches)
+        self.valid_unstable_arches = frozenset(f"~{x}" for x in self.valid_arches)
         self._git_addon = git_addon
         self._cleanup = []
+        # mapping of unversioned atoms to their current keywords
+        self._keywords_cache = {}
+        # mapping of unversioned atoms to whether they're newly added
+        self._added_cache = {}
 
     def cleanup(self):
         for repo in self._cleanup:
             repo.cleanup()
 
+    @klass.jit_attr
+    def _commit_paths(self):
+        """Mapping of removed and modified pkg dirs per commit."""
+        commit_paths = {"D": defaultdict(set), "M": defaultdict(set)}
+        # reuse the local commit history already parsed for the check's source
+        for pkg in self._git_addon.cached_commits_repo(git.GitChangedRepo):
+            if pkg.status == "R":
+                pkg = pkg.old_pkg()
+                commit_paths["D"][pkg.commit].add(pjoin(pkg.category, pkg.package))
+            elif pkg.status in commit_paths:
+                commit_paths[pkg.status][pkg.commit].add(pjoin(pkg.category, pkg.package))
+        return commit_paths
+
     @klass.jit_attr
     def removal_repo(self):
         """Create a repository of packages removed from git."""
-        self._cleanup.append(repo := _RemovalRepo(self.repo))
+        self._cleanup.append(repo := _RemovalRepo(self.repo, self._commit_paths["D"]))
         return repo
 
     @klass.jit_attr
     def modified_repo(self):
         """Create a repository of old packages newly modified in git."""
-        self._cleanup.append(repo := _RemovalRepo(self.repo))
+        self._cleanup.append(repo := _RemovalRepo(self.repo, self._commit_paths["M"]))
         return repo
 
     @klass.jit_attr
@@ -272,21 +365,40 @@ class GitPkgCommitsCheck(GentooRepoCheck, GitCommitsCheck):
         """Create/load cached repo of packages added to git."""
         return self._git_addon.cached_repo(git.GitAddedRepo)
 
+    def _current_keywords(self, atom):
+        """Return the keywords across all current versions of a package."""
+        key = str(atom)
+        try:
+            return self._keywords_cache[key]
+        except KeyError:
+            keywords = frozenset(_union_keywords(self.repo.match(atom)))
+            self._keywords_cache[key] = keywords
+            return keywords
+
+    def _newly_added(self, atom):
+        """Determine if a package has never been added to the upstream repo."""
+        key = str(atom)
+        try:
+            return self._added_cache[key]
+        except KeyError:
+            newly_added = not self.added_repo.match(atom)
+            self._added_cache[key] = newly_added
+            return newly_added
+
     def removal_checks(self, pkgs):
         """Check for issues due to package removals."""
         pkg = pkgs[0]
         removal_repo = self.removal_repo(pkgs)
 
-        old_keywords = set().union(*(p.keywords for p in removal_repo.match(pkg.unversioned_atom)))
-        new_keywords = set().union(*(p.keywords for p in self.repo.match(pkg.unversioned_atom)))
+        old_keywords = _union_keywords(removal_repo.match(pkg.unversioned_atom))
+        new_keywords = self._current_keywords(pkg.unversioned_atom)
 
         dropped_keywords = old_keywords - new_keywords
         dropped_stable_keywords = dropped_keywords & self.valid_arches
-        dropped_unstable_keywords = set()
-        for keyword in (x for x in dropped_keywords if x[0] == "~"):
-            arch = keyword[1:]
-            if arch in self.valid_arches and arch not in new_keywords:
-                dropped_unstable_keywords.add(keyword)
+        # ignore unstable keywords that were stabilized
+        dropped_unstable_keywords = {
+            x for x in dropped_keywords & self.valid_unstable_arches if x[1:] not in new_keywords
+        }
 
         if dropped_stable_keywords:
             yield DroppedStableKeywords(sort_keywords(dropped_stable_keywords), pkg.commit, pkg=pkg)
@@ -312,20 +424,22 @@ class GitPkgCommitsCheck(GentooRepoCheck, GitCommitsCheck):
         else:
             yield MissingMove(old_key, new_key, pkg=pkg)
 
-    def modified_checks(self, pkgs):
-        """Check for issues due to package modifications."""
-        pkg = pkgs[0]
-
+    def _modified_pkg(self, pkgs):
+        """Return the current package to compare modified packages against, if any."""
         try:
-            new_pkg = self.repo.match(pkg.versioned_atom)[0]
+            new_pkg = self.repo.match(pkgs[0].versioned_atom)[0]
         except IndexError:
             # ignore broken ebuild
-            return
+            return None
 
         # ignore live ebuilds
         if new_pkg.live:
-            return
+            return None
+        return new_pkg
 
+    def modified_checks(self, pkgs, new_pkg):
+        """Check for issues due to package modifications."""
+        pkg = pkgs[0]
         modified_repo = self.modified_repo(pkgs)
         try:
             old_pkg = modified_repo.match(pkg.versioned_atom)[0]
@@ -366,47 +480,60 @@ class GitPkgCommitsCheck(GentooRepoCheck, GitCommitsCheck):
                 pkg_map["A"].add(pkg)
                 pkg_map["D"].add(pkg.old_pkg())
 
+        removed = list(pkg_map["D"])
+        modified = [pkg for pkg in pkg_map["M"] if pkg not in pkg_map["D"]]
+        new_pkg = self._modified_pkg(modified) if modified else None
+
+        # extract historical pkgs for removal and modification checks in parallel
+        if removed and new_pkg is not None and self.options.jobs > 1:
+            repos = ((self.removal_repo, removed), (self.modified_repo, modified))
+            with ThreadPoolExecutor(max_workers=len(repos)) as executor:
+                futures = [executor.submit(repo.populate, pkgs) for repo, pkgs in repos]
+                for future in futures:
+                    future.result()
+
         # run removed package checks
-        if pkg_map["D"]:
-            yield from self.removal_checks(list(pkg_map["D"]))
+        if removed:
+            yield from self.removal_checks(removed)
         # run renamed package checks
         if pkg_map["R"]:
             yield from self.rename_checks(list(pkg_map["R"]))
         # run modified package checks
-        if modified := [pkg for pkg in pkg_map["M"] if pkg not in pkg_map["D"]]:
-            yield from self.modified_checks(modified)
+        if new_pkg is not None:
+            yield from self.modified_checks(modified, new_pkg)
 
-        for git_pkg in pkgset:
-            # remaining checks are irrelevant for removed packages
-            if git_pkg in pkg_map["D"]:
-                continue
+        # remaining checks are irrelevant for removed packages, each version is
+        # only checked once with added pkgs taking precedence over modified ones
+        changed = (pkg_map["A"] | pkg_map["M"]) - pkg_map["D"]
 
+        for git_pkg in sorted(changed):
             # pull actual package object from repo
             try:
                 pkg = next(self.repo.itermatch(git_pkg.versioned_atom))
-                line = next(pkg.ebuild.text_fileobj())
             except StopIteration:
                 # ignore broken ebuild caught by other checks
                 continue
 
+            # only the leading copyright line is required
+            with pkg.ebuild.bytes_fileobj() as f:
+                line = f.readline().decode("utf8", "replace")
+            if not line:
+                # ignore empty ebuild caught by other checks
+                continue
+
             # check copyright on new/modified ebuilds
-            if mo := copyright_regex.match(line):
-                year = mo.group("end")
-                if int(year) != self.today.year:
-                    yield EbuildIncorrectCopyright(year, line.strip("\n"), pkg=pkg)
+            if year := outdated_copyright_year(line, self.today.year):
+                yield EbuildIncorrectCopyright(year, line.strip("\n"), pkg=pkg)
 
             # checks for newly added ebuilds
             if git_pkg.status == "A":
                 # check for directly added stable ebuilds
                 if pkg.category not in self.allowed_direct_stable:
-                    if stable_keywords := sorted(x for x in pkg.keywords if x[0] not in "~-"):
+                    if stable_keywords := sorted(self.valid_arches.intersection(pkg.keywords)):
                         yield DirectStableKeywords(stable_keywords, pkg=pkg)
 
-                # pkg was just added to the tree
-                newly_added = not self.added_repo.match(git_pkg.unversioned_atom)
-
-                # check for no maintainers
-                if not pkg.maintainers and newly_added:
+                # check for no maintainers on pkgs just added to the tree
+                if not pkg.maintainers and self._newly_added(git_pkg.unversioned_atom):
                     yield DirectNoMaintainer(pkg=pkg)
 
 
@@ -696,7 +823,5 @@ class GitEclassCommitsCheck(GentooRepoCheck, GitCommitsCheck):
     def feed(self, eclass):
         # check copyright on new/modified eclasses
         line = next(iter(eclass.lines))
-        if mo := copyright_regex.match(line):
-            year = mo.group("end")
-            if int(year) != self.today.year:
-                yield EclassIncorrectCopyright(year, line.strip("\n"), eclass=eclass)
+        if year := outdated_copyright_year(line, self.today.year):
+            yield EclassIncorrectCopyright(year, line.strip("\n"), eclass=eclass)
@@ -194,6 +194,15 @@ class _ChecksLazyDict(_LazyDict):
             {k: v for k, v in self._dict.items() if not issubclass(v, checks.OptionalCheck)}
         )
 
+    @klass.jit_attr
+    def by_keyword(self):
+        """Mapping of keywords to all checks that can generate them."""
+        keyword_checks = {}
+        for check in self._dict.values():
+            for keyword in check.known_results:
+                keyword_checks.setdefault(keyword, set()).add(check)
+        return ImmutableDict((k, frozenset(v)) for k, v in keyword_checks.items())
+
 
 KEYWORDS = _KeywordsLazyDict("KEYWORDS", ("checks", "results.Result"))
 CHECKS = _ChecksLazyDict("CHECKS", ("checks", "checks.Check"))
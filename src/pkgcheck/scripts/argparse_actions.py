@@ -209,9 +209,15 @@ class ChecksetArgs(arghparse.CommaSeparatedNegations):
         # parse check/keyword args related to checksets
         args = []
         if enabled_keywords:
-            keywords_set = {objects.KEYWORDS[x] for x in enabled_keywords}
+            keyword_checks = objects.CHECKS.by_keyword
             checks = ",".join(
-                k for k, v in objects.CHECKS.items() if v.known_results.intersection(keywords_set)
+                sorted(
+                    {
+                        c.__name__
+                        for x in enabled_keywords
+                        for c in keyword_checks.get(objects.KEYWORDS[x], ())
+                    }
+                )
             )
             args.append(f"--checks={checks}")
         keywords = ",".join(enabled_keywords | {f"-{x}" for x in disabled_keywords})
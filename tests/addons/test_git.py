@@ -659,6 +659,12 @@ class TestGitAddon:
         assert len(commits_repo) == 1
         assert atom_cls("=cat/pkg-1") in commits_repo
 
+        # previously parsed local commits are reused without querying git
+        with patch("pkgcheck.addons.git.GitLog") as git_log:
+            git_log.side_effect = git.GitError("git parsing failed")
+            commits_repo = self.addon.cached_commits_repo(git.GitChangedRepo)
+        assert atom_cls("=cat/pkg-1") in commits_repo
+
         # failing to parse git log returns error with git cache enabled
         with patch("pkgcheck.addons.git.GitLog") as git_log:
             git_log.side_effect = git.GitError("git parsing failed")
@@ -17,6 +17,15 @@ def test_keywords():
         assert cls.level is not None, f"result class {name!r} missing level"
 
 
+def test_checks_by_keyword():
+    """Verify the inverse keyword to checks mapping matches check known results."""
+    for keyword, checks in objects.CHECKS.by_keyword.items():
+        assert checks == {x for x in objects.CHECKS.values() if keyword in x.known_results}
+    for check in objects.CHECKS.values():
+        for keyword in check.known_results:
+            assert check in objects.CHECKS.by_keyword[keyword]
+
+
 class TestMetadataError:
     """Test MetadataError attribute registry."""
 
@@ -1,6 +1,8 @@
 import os
+import subprocess
 import textwrap
 from datetime import datetime, timedelta
+from io import BytesIO
 from unittest.mock import patch
 
 import pytest
@@ -465,6 +467,39 @@ class TestGitPkgCommitsCheck(ReportTestCase):
         expected = git_mod.EbuildIncorrectCopyright("2019", line=line, pkg=CPV("cat/pkg-1"))
         assert r == expected
 
+    def test_ebuild_incorrect_copyright_long_line(self):
+        self.child_repo.create_ebuild("cat/pkg-1")
+        line = "# Copyright 1999-2019 Gentoo Authors" + " and others" * 30
+        with open(pjoin(self.child_git_repo.path, "cat/pkg/pkg-1.ebuild"), "r+") as f:
+            lines = f.read().splitlines()
+            lines[0] = line
+            f.seek(0)
+            f.truncate()
+            f.write("\n".join(lines))
+        self.child_git_repo.add_all("cat/pkg: version bump to 1")
+        self.init_check()
+        # the full copyright line is reported
+        r = self.assertReport(self.check, self.source)
+        expected = git_mod.EbuildIncorrectCopyright("2019", line=line, pkg=CPV("cat/pkg-1"))
+        assert r == expected
+
+    def test_ebuild_incorrect_copyright_added_and_modified(self):
+        self.child_repo.create_ebuild("cat/pkg-1")
+        self.child_git_repo.add_all("cat/pkg: version bump to 1")
+        line = "# Copyright 1999-2019 Gentoo Authors"
+        with open(pjoin(self.child_git_repo.path, "cat/pkg/pkg-1.ebuild"), "r+") as f:
+            lines = f.read().splitlines()
+            lines[0] = line
+            f.seek(0)
+            f.truncate()
+            f.write("\n".join(lines))
+        self.child_git_repo.add_all("cat/pkg: update ebuild")
+        self.init_check()
+        # ebuilds changed in multiple commits are only reported once
+        r = self.assertReport(self.check, self.source)
+        expected = git_mod.EbuildIncorrectCopyright("2019", line=line, pkg=CPV("cat/pkg-1"))
+        assert r == expected
+
     def test_missing_copyright(self):
         """Ebuilds missing copyrights entirely are handled by EbuildHeaderCheck."""
         self.child_repo.create_ebuild("cat/pkg-1")
@@ -491,8 +526,10 @@ class TestGitPkgCommitsCheck(ReportTestCase):
         assert r == expected
 
         # git archive failures error out
+        self.init_check()
         with patch("pkgcheck.checks.git.subprocess.Popen") as git_archive:
-            git_archive.return_value.poll.return_value = -1
+            git_archive.return_value.stdout = BytesIO()
+            git_archive.return_value.wait.return_value = -1
             with pytest.raises(PkgcheckUserException, match="failed populating archive repo"):
                 self.assertNoReport(self.check, self.source)
 
@@ -525,6 +562,87 @@ class TestGitPkgCommitsCheck(ReportTestCase):
         expected = git_mod.DroppedUnstableKeywords(["~amd64"], commit, pkg=CPV("cat/pkg-1"))
         assert r == expected
 
+    def test_dropped_keywords_same_commit(self):
+        # add ebuilds inheriting an eclass to parent repo
+        with open(pjoin(self.parent_git_repo.path, "eclass/make.eclass"), "w") as f:
+            f.write(":")
+        self.parent_git_repo.add_all("make.eclass: initial commit")
+        self.parent_repo.create_ebuild("cat/pkg-1", keywords=["~amd64"], data="inherit make")
+        self.parent_repo.create_ebuild("cat/newpkg-1", keywords=["amd64"], data="inherit make")
+        self.parent_git_repo.add_all("cat: add pkgs")
+        # pull changes and remove both from the child repo in a single commit
+        self.child_git_repo.run(["git", "pull", "origin", "main"])
+        self.child_git_repo.remove("cat/pkg/pkg-1.ebuild", commit=False)
+        self.child_git_repo.remove_all("cat/newpkg", msg="cat: remove pkgs")
+        commit = self.child_git_repo.HEAD
+        self.init_check()
+        with patch("pkgcheck.checks.git.subprocess.Popen", wraps=subprocess.Popen) as popen:
+            r = self.assertReports(self.check, self.source)
+        assert set(r) == {
+            git_mod.DroppedStableKeywords(["amd64"], commit, pkg=CPV("cat/newpkg-1")),
+            git_mod.DroppedUnstableKeywords(["~amd64"], commit, pkg=CPV("cat/pkg-1")),
+        }
+        # both pkgs are pulled from a single archive
+        git_archives = [x for x in popen.call_args_list if "archive" in x.args[0]]
+        assert len(git_archives) == 1
+
+    def test_dropped_keywords_batched_pkg_reextracted(self, monkeypatch):
+        # add ebuilds to parent repo
+        self.parent_repo.create_ebuild("cat/a-1", keywords=["~amd64"])
+        self.parent_repo.create_ebuild("cat/a-2", keywords=["~amd64"])
+        self.parent_repo.create_ebuild("cat/b-0", keywords=["~amd64"])
+        self.parent_repo.create_ebuild("cat/b-1", keywords=["~amd64"])
+        self.parent_git_repo.add_all("cat: add pkgs")
+        self.child_git_repo.run(["git", "pull", "origin", "main"])
+        # use distinct commit times so the oldest pkg commits are deterministic
+        timestamp = int(datetime.now().timestamp())
+        monkeypatch.setenv("GIT_COMMITTER_DATE", f"{timestamp + 10} +0000")
+        self.child_git_repo.remove("cat/b/b-1.ebuild", msg="cat/b: remove 1")
+        monkeypatch.setenv("GIT_COMMITTER_DATE", f"{timestamp + 20} +0000")
+        self.child_repo.create_ebuild("cat/b-2", keywords=["amd64"])
+        self.child_git_repo.add_all("cat/b: version bump to 2")
+        monkeypatch.setenv("GIT_COMMITTER_DATE", f"{timestamp + 30} +0000")
+        self.child_repo.create_ebuild("cat/b-2", keywords=["~amd64"])
+        self.child_git_repo.remove("cat/a/a-1.ebuild", commit=False)
+        self.child_git_repo.remove("cat/b/b-0.ebuild", commit=False)
+        self.child_git_repo.add_all("cat: remove old versions")
+        self.init_check()
+        # ebuilds from a later batched archive don't leak into older pkg states
+        self.assertNoReport(self.check, self.source)
+
+    def test_rdepend_change_batched_eclass(self, monkeypatch):
+        # add ebuilds inheriting an eclass to parent repo
+        with open(pjoin(self.parent_git_repo.path, "eclass/make.eclass"), "w") as f:
+            f.write(":")
+        self.parent_git_repo.add_all("make.eclass: initial commit")
+        for pkg in ("cat/a-1", "cat/b-1", "cat/c-1"):
+            self.parent_repo.create_ebuild(pkg, data="inherit make")
+        self.parent_git_repo.add_all("cat: add pkgs")
+        self.child_git_repo.run(["git", "pull", "origin", "main"])
+        # use distinct commit times so the oldest pkg commits are deterministic
+        timestamp = int(datetime.now().timestamp())
+        monkeypatch.setenv("GIT_COMMITTER_DATE", f"{timestamp + 10} +0000")
+        for pkg in ("a/a-1", "c/c-1"):
+            with open(pjoin(self.child_git_repo.path, f"cat/{pkg}.ebuild"), "a") as f:
+                f.write("# update\n")
+        self.child_git_repo.add_all("cat: update a and c")
+        monkeypatch.setenv("GIT_COMMITTER_DATE", f"{timestamp + 20} +0000")
+        with open(pjoin(self.child_git_repo.path, "eclass/make.eclass"), "w") as f:
+            f.write('RDEPEND="cat/pkg"\n')
+        self.child_git_repo.add_all("make.eclass: add deps")
+        monkeypatch.setenv("GIT_COMMITTER_DATE", f"{timestamp + 30} +0000")
+        with open(pjoin(self.child_git_repo.path, "cat/b/b-1.ebuild"), "a") as f:
+            f.write("# update\n")
+        self.child_git_repo.add_all("cat/b: update")
+        monkeypatch.setenv("GIT_COMMITTER_DATE", f"{timestamp + 40} +0000")
+        with open(pjoin(self.child_git_repo.path, "eclass/make.eclass"), "w") as f:
+            f.write(":")
+        self.child_git_repo.add_all("make.eclass: drop deps")
+        self.init_check()
+        # batched pkgs are sourced against the eclass from their own parent commit
+        r = self.assertReport(self.check, self.source)
+        assert r == git_mod.RdependChange(pkg=CPV("cat/b-1"))
+
     def test_rdepend_change(self):
         # add pkgs to parent repo
         self.parent_repo.create_ebuild("cat/dep1-0")
@@ -586,8 +704,10 @@ class TestGitPkgCommitsCheck(ReportTestCase):
         self.assertNoReport(self.check, self.source)
 
         # git archive failures error out
+        self.init_check()
         with patch("pkgcheck.checks.git.subprocess.Popen") as git_archive:
-            git_archive.return_value.poll.return_value = -1
+            git_archive.return_value.stdout = BytesIO()
+            git_archive.return_value.wait.return_value = -1
             with pytest.raises(PkgcheckUserException, match="failed populating archive repo"):
                 self.assertNoReport(self.check, self.source)
 
@@ -650,6 +770,81 @@ class TestGitPkgCommitsCheck(ReportTestCase):
         self.init_check()
         self.assertNoReport(self.check, self.source)
 
+    def test_removal_and_modification(self):
+        # add stable and unstable ebuilds to parent repo
+        self.parent_repo.create_ebuild("cat/pkg-1", keywords=["amd64"])
+        self.parent_repo.create_ebuild("cat/pkg-2", keywords=["~amd64"])
+        self.parent_git_repo.add_all("cat/pkg: version bump to 1 and 2")
+        # pull changes, remove the stable ebuild, and modify the other's slot
+        self.child_git_repo.run(["git", "pull", "origin", "main"])
+        self.child_git_repo.remove("cat/pkg/pkg-1.ebuild", msg="cat/pkg: remove 1")
+        commit = self.child_git_repo.HEAD
+        self.child_repo.create_ebuild("cat/pkg-2", keywords=["~amd64"], slot="1")
+        self.child_git_repo.add_all("cat/pkg: update SLOT to 1")
+
+        for jobs in (1, 2):
+            options = self._options()
+            options.jobs = jobs
+            self.init_check(options)
+            r = self.assertReports(self.check, self.source)
+            assert set(r) == {
+                git_mod.DroppedStableKeywords(["amd64"], commit, pkg=CPV("cat/pkg-1")),
+                git_mod.MissingSlotmove("0", "1", pkg=CPV("cat/pkg-2")),
+            }
+
+    def test_modification_and_removal_separate_parents(self, monkeypatch):
+        # add stable and unstable ebuilds to parent repo
+        self.parent_repo.create_ebuild("cat/pkg-1", keywords=["amd64"])
+        self.parent_repo.create_ebuild("cat/pkg-2", keywords=["~amd64"])
+        self.parent_git_repo.add_all("cat/pkg: version bump to 1 and 2")
+        self.child_git_repo.run(["git", "pull", "origin", "main"])
+        # modify an ebuild's slot and remove the stable ebuild in a later commit
+        timestamp = int(datetime.now().timestamp())
+        monkeypatch.setenv("GIT_COMMITTER_DATE", f"{timestamp + 10} +0000")
+        self.child_repo.create_ebuild("cat/pkg-2", keywords=["~amd64"], slot="1")
+        self.child_git_repo.add_all("cat/pkg: update SLOT to 1")
+        monkeypatch.setenv("GIT_COMMITTER_DATE", f"{timestamp + 20} +0000")
+        self.child_git_repo.remove("cat/pkg/pkg-1.ebuild", msg="cat/pkg: remove 1")
+        commit = self.child_git_repo.HEAD
+
+        options = self._options()
+        options.jobs = 2
+        self.init_check(options)
+        with patch("pkgcheck.checks.git.subprocess.Popen", wraps=subprocess.Popen) as popen:
+            r = self.assertReports(self.check, self.source)
+        assert set(r) == {
+            git_mod.DroppedStableKeywords(["amd64"], commit, pkg=CPV("cat/pkg-1")),
+            git_mod.MissingSlotmove("0", "1", pkg=CPV("cat/pkg-2")),
+        }
+        # each repo is populated from its own parent commit
+        git_archives = [x.args[0] for x in popen.call_args_list if "archive" in x.args[0]]
+        parents = {args[args.index("archive") + 1] for args in git_archives}
+        assert len(git_archives) == 2
+        assert len(parents) == 2
+
+    def test_removal_and_live_modification(self):
+        # add stable and live ebuilds to parent repo
+        self.parent_repo.create_ebuild("cat/pkg-1", keywords=["amd64"])
+        self.parent_repo.create_ebuild("cat/pkg-9999", properties="live")
+        self.parent_git_repo.add_all("cat/pkg: version bump to 1 and 9999")
+        # pull changes, remove the stable ebuild, and modify the live one
+        self.child_git_repo.run(["git", "pull", "origin", "main"])
+        self.child_git_repo.remove("cat/pkg/pkg-1.ebuild", msg="cat/pkg: remove 1")
+        commit = self.child_git_repo.HEAD
+        with open(pjoin(self.child_git_repo.path, "cat/pkg/pkg-9999.ebuild"), "a") as f:
+            f.write('RDEPEND="cat/dep"\n')
+        self.child_git_repo.add_all("cat/pkg: update deps")
+
+        options = self._options()
+        options.jobs = 2
+        self.init_check(options)
+        with patch("pkgcheck.checks.git.subprocess.Popen", wraps=subprocess.Popen) as popen:
+            r = self.assertReport(self.check, self.source)
+        assert r == git_mod.DroppedStableKeywords(["amd64"], commit, pkg=CPV("cat/pkg-1"))
+        # historical live ebuilds aren't extracted since they're never checked
+        git_archives = [x for x in popen.call_args_list if "archive" in x.args[0]]
+        assert len(git_archives) == 1
+
 
 class TestGitEclassCommitsCheck(ReportTestCase):
 
@@ -722,3 +917,19 @@ class TestGitEclassCommitsCheck(ReportTestCase):
         self.child_git_repo.add_all("eclass: update foo")
         self.init_check()
         self.assertNoReport(self.check, self.source)
+
+
+@pytest.mark.parametrize(
+    ("line", "expected"),
+    (
+        ("# Copyright 2020 Gentoo Authors", None),
+        ("# Copyright 1999-2020 Gentoo Authors", None),
+        ("# Copyright 1999-2019 Gentoo Authors", "2019"),
+        ("# Copyright 2020-2019 Gentoo Authors", "2019"),
+        ("# Copyright 2019 2020 Gentoo Authors", "2019"),
+        ("# Copyright 2019", None),
+        ("# Distributed under the terms of the GNU General Public License v2", None),
+    ),
+)
+def test_outdated_copyright_year(line, expected):
+    assert git_mod.outdated_copyright_year(line, 2020) == expected
@@ -4,7 +4,6 @@ import shutil
 import subprocess
 import tempfile
 import textwrap
-from collections import defaultdict
 from functools import partial
 from io import StringIO
 from operator import attrgetter
@@ -435,15 +434,14 @@ class TestPkgcheckScan:
                 self.script()
             assert excinfo.value.code == 1
 
-        # selective error results will only flag those specified
-        with patch("sys.argv", self.args + args + ["--exit", "InvalidSlot"]):
-            with pytest.raises(SystemExit) as excinfo:
-                self.script()
-            assert excinfo.value.code == 0
-        with patch("sys.argv", self.args + args + ["--exit", "InvalidEapi"]):
-            with pytest.raises(SystemExit) as excinfo:
-                self.script()
-            assert excinfo.value.code == 1
+        # selective error results will only flag those specified, the exit
+        # status is determined by the pipeline errors so skip the script wrapper
+        pipe = self.scan(self.scan_args + args + ["--exit", "InvalidSlot"])
+        assert list(pipe)
+        assert not pipe.errors
+        pipe = self.scan(self.scan_args + args + ["--exit", "InvalidEapi"])
+        assert list(pipe)
+        assert pipe.errors
 
     def test_filter_latest(self, make_repo):
         repo = make_repo(arches=["amd64"])
@@ -456,9 +454,8 @@ class TestPkgcheckScan:
 
         # results for old pkgs will be shown by default
         args = ["-r", repo.location]
-        with patch("sys.argv", self.args + args):
-            results = list(self.scan(self.scan_args + args))
-            assert len(results) == 1
+        results = list(self.scan(self.scan_args + args))
+        assert len(results) == 1
 
         # but are ignored when running using the 'latest' filter
         for opt in ("-f", "--filter"):
@@ -513,17 +510,24 @@ class TestPkgcheckScan:
             with pytest.raises(base.PkgcheckException, match="Exception: pipeline failed"):
                 list(self.scan(self.scan_args))
 
-    # nested mapping of repos to checks/keywords they cover
-    _checks = defaultdict(lambda: defaultdict(set))
+    @pytest.fixture(scope="class")
+    def repo_checks(self):
+        """Nested mapping of repos to checks/keywords they cover."""
+        return {
+            repo: {
+                check.name: {keyword.name for keyword in check.iterdir()}
+                for check in (self.repos_data / repo).iterdir()
+            }
+            for repo in self.repos
+        }
 
     @pytest.mark.parametrize("repo", repos)
-    def test_scan_repo_data(self, repo):
+    def test_scan_repo_data(self, repo, repo_checks):
         """Make sure the test data is up to date check/result naming wise."""
-        for check in (self.repos_data / repo).iterdir():
-            assert check.name in objects.CHECKS
-            for keyword in check.iterdir():
-                assert keyword.name in objects.KEYWORDS
-                self._checks[repo][check.name].add(keyword.name)
+        for check, keywords in repo_checks[repo].items():
+            assert check in objects.CHECKS
+            for keyword in keywords:
+                assert keyword in objects.KEYWORDS
 
     @staticmethod
     def _script(fix, repo_path):
@@ -533,31 +537,45 @@ class TestPkgcheckScan:
             error = exc.stderr if exc.stderr else exc.stdout
             pytest.fail(error)
 
+    @pytest.fixture(scope="class")
+    def triggered_repos(self, tmp_path_factory):
+        """Mapping of repos to their paths with all existing triggers run.
+
+        Repos with triggers are copied and triggered once, on first use, and
+        shared across all scans of the repo.
+        """
+        repos = {}
+
+        def triggered_repo(repo):
+            try:
+                return repos[repo]
+            except KeyError:
+                pass
+
+            repo_dir = self.repos_dir / repo
+            # triggers only exist at the keyword level of the repo data tree
+            triggers = sorted((self.repos_data / repo).glob("*/*/trigger.sh"))
+            if triggers:
+                triggered_repo = tmp_path_factory.mktemp("triggered") / repo
+                shutil.copytree(repo_dir, triggered_repo)
+                for trigger in triggers:
+                    self._script(trigger, triggered_repo)
+                repo_dir = triggered_repo
+
+            repos[repo] = repo_dir
+            return repo_dir
+
+        return triggered_repo
+
     # mapping of repos to scanned results
     _results = {}
     _verbose_results = {}
 
     @pytest.mark.parametrize("repo", repos)
-    def test_scan_repo(self, repo, tmp_path, verbosity=0):
+    def test_scan_repo(self, repo, triggered_repos, repo_checks, verbosity=0):
         """Scan a target repo, saving results for verification."""
-        repo_dir = self.repos_dir / repo
-
-        # run all existing triggers
-        triggers = [
-            pjoin(root, "trigger.sh")
-            for root, _dirs, files in os.walk(self.repos_data / repo)
-            if "trigger.sh" in files
-        ]
-        if triggers:
-            triggered_repo = tmp_path / f"triggered-{repo}"
-            shutil.copytree(repo_dir, triggered_repo)
-            for trigger in triggers:
-                self._script(trigger, triggered_repo)
-            repo_dir = triggered_repo
-
-        if repo not in self._checks:
-            self.test_scan_repo_data(repo)
-        args = (["-v"] * verbosity) + ["-r", str(repo_dir), "-c", ",".join(self._checks[repo])]
+        repo_dir = triggered_repos(repo)
+        args = (["-v"] * verbosity) + ["-r", str(repo_dir), "-c", ",".join(repo_checks[repo])]
 
         # add any defined extra repo args
         try:
@@ -581,9 +599,9 @@ class TestPkgcheckScan:
             assert len(results) == len(self._results[repo])
 
     @pytest.mark.parametrize("repo", repos)
-    def test_scan_repo_verbose(self, repo, tmp_path):
+    def test_scan_repo_verbose(self, repo, triggered_repos, repo_checks):
         """Scan a target repo in verbose mode, saving results for verification."""
-        return self.test_scan_repo(repo, tmp_path, verbosity=1)
+        return self.test_scan_repo(repo, triggered_repos, repo_checks, verbosity=1)
 
     def _get_results(self, path):
         """Return the set of result objects from a given json stream file."""
@@ -604,15 +622,15 @@ class TestPkgcheckScan:
             return output
 
     @pytest.mark.parametrize("repo", repos)
-    def test_scan_verify(self, repo, tmp_path):
+    def test_scan_verify(self, repo, triggered_repos, repo_checks):
         """Run pkgcheck against test pkgs in bundled repo, verifying result output."""
         results = set()
         verbose_results = set()
         if repo not in self._results:
-            self.test_scan_repo(repo, tmp_path, verbosity=0)
+            self.test_scan_repo(repo, triggered_repos, repo_checks, verbosity=0)
         if repo not in self._verbose_results:
-            self.test_scan_repo(repo, tmp_path, verbosity=0)
-        for check, keywords in self._checks[repo].items():
+            self.test_scan_repo(repo, triggered_repos, repo_checks, verbosity=0)
+        for check, keywords in repo_checks[repo].items():
             for keyword in keywords:
                 # verify the expected results were seen during the repo scans
                 expected_results = self._get_results(f"{repo}/{check}/{keyword}/expected.json")
@@ -667,20 +685,26 @@ class TestPkgcheckScan:
                 error = exc.stderr if exc.stderr else exc.stdout
                 pytest.fail(error)
 
+    @pytest.fixture(scope="class")
+    def fixes(self):
+        """Mapping of (repo, check, keyword) keys to their related fixes."""
+        fixes = {}
+        # prefer patches over scripts when both exist
+        for name in ("fix.sh", "fix.patch"):
+            for fix in self.repos_data.glob(f"*/*/*/{name}"):
+                fixes[fix.parts[-4:-1]] = fix
+        return fixes
+
     @pytest.mark.parametrize("check, result", _all_results)
-    def test_fix(self, check, result, tmp_path):
+    def test_fix(self, check, result, fixes, tmp_path):
         """Apply fixes to pkgs, verifying the related results are fixed."""
         check_name = check.__name__
         keyword = result.__name__
         tested = False
         for repo in self.repos:
-            keyword_dir = self.repos_data / repo / check_name / keyword
-            if (fix := keyword_dir / "fix.patch").exists():
-                func = self._patch
-            elif (fix := keyword_dir / "fix.sh").exists():
-                func = self._script
-            else:
+            if (fix := fixes.get((repo, check_name, keyword))) is None:
                 continue
+            func = self._patch if fix.suffix == ".patch" else self._script
 
             # apply a fix if one exists and make sure the related result doesn't appear
             repo_dir = self.repos_dir / repo